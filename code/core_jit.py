@@ -0,0 +1,116 @@
+"""Optional Numba-compiled executor for the single-stage core.
+
+The kernel runs the fetch/decode/execute loop over plain numeric arrays in
+nopython mode, so it can only be used when per-cycle state dumping is
+disabled (the dumps need Python-side file I/O every cycle). Importing this
+module is always safe: without numba/numpy installed, run_ss is None and
+the caller sticks to the interpreted path.
+"""
+
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:
+    np = None
+    run_ss = None
+else:
+    @njit(cache=True)
+    def run_ss(imem, regs, dmem, pc, max_cycles):
+        """Run the single-stage core to halt over uint8/uint32 arrays.
+
+        Mirrors SingleStageCore.step cycle accounting exactly: HALT costs
+        two dump cycles, running off the end of IMEM costs one. Returns
+        (pc, cycles, retired, ok); ok is False when a memory access falls
+        outside the preallocated dmem, in which case the caller must
+        replay on the interpreted path that can grow memory.
+        """
+        cycle = 0
+        retired = 0
+        n_imem = imem.shape[0]
+        n_dmem = dmem.shape[0]
+        while True:
+            if pc >= n_imem:
+                cycle += 1
+                break
+            instr = 0
+            for k in range(4):
+                b = imem[pc + k] if pc + k < n_imem else 0
+                instr = (instr << 8) | b
+            opcode = instr & 0x7F
+            if opcode == 0x7F:  # HALT dumps two trailing cycles
+                retired += 1
+                pc = (pc + 4) & 0xFFFFFFFF
+                cycle += 2
+                break
+            rd = (instr >> 7) & 0x1F
+            funct3 = (instr >> 12) & 0x7
+            rs1 = (instr >> 15) & 0x1F
+            rs2 = (instr >> 20) & 0x1F
+            funct7 = (instr >> 25) & 0x7F
+            a = regs[rs1]
+            b = regs[rs2]
+            next_pc = (pc + 4) & 0xFFFFFFFF
+            wb = 0
+            wb_en = False
+            if opcode == 0x33:
+                if funct3 == 0x0 and funct7 == 0x00:
+                    wb = a + b
+                elif funct3 == 0x0 and funct7 == 0x20:
+                    wb = a - b
+                elif funct3 == 0x4:
+                    wb = a ^ b
+                elif funct3 == 0x6:
+                    wb = a | b
+                elif funct3 == 0x7:
+                    wb = a & b
+                wb_en = True
+            elif opcode == 0x13:
+                imm = (((instr >> 20) & 0xFFF) ^ 0x800) - 0x800
+                if funct3 == 0x0:
+                    wb = a + imm
+                elif funct3 == 0x4:
+                    wb = a ^ (imm & 0xFFFFFFFF)
+                elif funct3 == 0x6:
+                    wb = a | (imm & 0xFFFFFFFF)
+                elif funct3 == 0x7:
+                    wb = a & (imm & 0xFFFFFFFF)
+                wb_en = True
+            elif opcode == 0x03:
+                imm = (((instr >> 20) & 0xFFF) ^ 0x800) - 0x800
+                addr = (a + imm) & 0xFFFFFFFF
+                if addr + 4 > n_dmem:
+                    return pc, cycle, retired, False
+                wb = 0
+                for k in range(4):
+                    wb = (wb << 8) | dmem[addr + k]
+                wb_en = True
+            elif opcode == 0x23:
+                imm = (((((instr >> 25) << 5) | ((instr >> 7) & 0x1F)) & 0xFFF) ^ 0x800) - 0x800
+                addr = (a + imm) & 0xFFFFFFFF
+                if addr + 4 > n_dmem:
+                    return pc, cycle, retired, False
+                dmem[addr] = (b >> 24) & 0xFF
+                dmem[addr + 1] = (b >> 16) & 0xFF
+                dmem[addr + 2] = (b >> 8) & 0xFF
+                dmem[addr + 3] = b & 0xFF
+            elif opcode == 0x63:
+                v = ((((instr >> 31) & 0x1) << 12) | (((instr >> 25) & 0x3F) << 5) |
+                     (((instr >> 8) & 0xF) << 1) | (((instr >> 7) & 0x1) << 11))
+                imm = (v ^ 0x1000) - 0x1000
+                if (funct3 == 0x0 and a == b) or (funct3 == 0x1 and a != b):
+                    next_pc = (pc + imm) & 0xFFFFFFFF
+            elif opcode == 0x6F:
+                v = ((((instr >> 31) & 0x1) << 20) | (((instr >> 12) & 0xFF) << 12) |
+                     (((instr >> 20) & 0x1) << 11) | (((instr >> 21) & 0x3FF) << 1))
+                imm = (v ^ 0x100000) - 0x100000
+                wb = (pc + 4) & 0xFFFFFFFF
+                wb_en = True
+                next_pc = (pc + imm) & 0xFFFFFFFF
+            if wb_en and rd != 0:
+                regs[rd] = wb & 0xFFFFFFFF
+            pc = next_pc
+            retired += 1
+            cycle += 1
+            if cycle >= max_cycles:
+                break
+        return pc, cycle, retired, True